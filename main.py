@@ -1,30 +1,49 @@
-from pyatlan.client.atlan import AtlanClient
+from pyatlan.client.atlan import AtlanClient, DEFAULT_RETRY
 import os
 import json
+import functools
+import time
 import logging
 import boto3
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional, Tuple
 from dotenv import load_dotenv
 from botocore import UNSIGNED
 from botocore.client import Config
+from httpx_retries import Retry, RetryTransport
 
 from pyatlan.model.assets import Connection, S3Bucket, S3Object, Table, Process, Asset, Column
+from pyatlan.errors import AtlanError
 from pyatlan.model.enums import AtlanConnectorType
-from pyatlan.model.fluent_search import FluentSearch
+from pyatlan.model.fluent_search import CompoundQuery, FluentSearch
+from pyatlan.model.response import AssetMutationResponse
+from pyatlan.model.search import IndexSearchRequest
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
+# Configure logging (set LOG_LEVEL=DEBUG for per-asset, per-object and per-process details).
+# LOG_LEVEL only applies to this script's logger so library debug output stays hidden.
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+LOG_LEVEL = (os.getenv("LOG_LEVEL") or "INFO").upper()
+if isinstance(logging.getLevelName(LOG_LEVEL), int):
+    logger.setLevel(LOG_LEVEL)
+else:
+    logger.setLevel(logging.INFO)
+    logger.warning("⚠️ Unknown LOG_LEVEL '%s', using INFO", LOG_LEVEL)
+
 # Configuration constants from environment variables
 CACHE_EXPIRY_HOURS = int(os.getenv("CACHE_EXPIRY_HOURS"))
 POSTGRES_CACHE_FILE = os.getenv("POSTGRES_CACHE_FILE")
 SNOWFLAKE_CACHE_FILE = os.getenv("SNOWFLAKE_CACHE_FILE")
 
+# In-process copies of cache files, keyed by filename -> (mtime_ns, cache_data)
+_CACHE_MEM: Dict[str, Tuple[int, Dict]] = {}
+
 # Atlan Tenant configuration
 ATLAN_BASE_URL = os.getenv("ATLAN_BASE_URL")
 ATLAN_API_TOKEN = os.getenv("ATLAN_API_TOKEN")
@@ -39,11 +58,75 @@ S3_PREFIX = os.getenv("S3_PREFIX")
 POSTGRES_CONNECTION_NAME = os.getenv("POSTGRES_CONNECTION_NAME")
 SNOWFLAKE_CONNECTION_NAME = os.getenv("SNOWFLAKE_CONNECTION_NAME")
 
+# Asset types discovered under each database connection
+CONNECTION_ASSET_TYPES = ["Database", "Schema", "Table", "Column"]
+
+# Assets fetched per search page when enumerating a connection (fewer round trips than the default)
+CONNECTION_ASSETS_PAGE_SIZE = 500
+
+# HTTP connection pool shared by all Atlan API calls
+ATLAN_POOL_SIZE = 32
+ATLAN_KEEPALIVE_SECONDS = 60
+
+# Concurrent workers for per-asset saves (kept below the connection pool size)
+SAVE_MAX_WORKERS = 8
+
+# Bulk save requests in flight at once (each may fall back to SAVE_MAX_WORKERS per-asset saves)
+SAVE_BATCH_WORKERS = 4
+
+# Maximum number of lineage processes sent in one bulk save request
+PROCESS_BATCH_SIZE = 250
+
+# Maximum number of S3 objects sent in one bulk save request
+S3_OBJECT_BATCH_SIZE = 50
+
+# Retry throttled/failed Atlan calls with short, jittered, capped exponential backoff (honours Retry-After)
+ATLAN_RETRY = Retry(
+    total=5,
+    backoff_factor=0.25,
+    max_backoff_wait=8.0,
+    backoff_jitter=1.0,
+    status_forcelist=DEFAULT_RETRY.status_forcelist,
+    allowed_methods=DEFAULT_RETRY.allowed_methods,
+    respect_retry_after_header=True,
+)
+
 client = AtlanClient(
     base_url=ATLAN_BASE_URL,
-    api_key=ATLAN_API_TOKEN
+    api_key=ATLAN_API_TOKEN,
+    retry=ATLAN_RETRY
+)
+
+# Keep connections alive between calls so each save/search reuses an open TLS session.
+# pyatlan (>= 8, httpx-based) has no public hook for connection limits, so swap the private
+# transport the same way its own AtlanClient.max_retries() context manager does.
+client._session._transport = RetryTransport(
+    transport=httpx.HTTPTransport(
+        limits=httpx.Limits(
+            max_connections=ATLAN_POOL_SIZE,
+            max_keepalive_connections=ATLAN_POOL_SIZE,
+            keepalive_expiry=ATLAN_KEEPALIVE_SECONDS,
+        )
+    ),
+    retry=client.retry,
 )
 
+# Shared unsigned S3 client for public bucket access, created once per process
+s3_client = boto3.client(
+    's3',
+    config=Config(
+        signature_version=UNSIGNED,
+        retries={'max_attempts': 3, 'mode': 'adaptive'},
+    )
+)
+
+
+class AssetRow(NamedTuple):
+    """Asset discovered under a connection (stored in the cache files as [qualified_name, name, type_name])"""
+    qualified_name: str
+    name: str
+    type_name: str
+
 
 def clear_all_cache():
     """
@@ -52,13 +135,14 @@ def clear_all_cache():
     cache_files = [POSTGRES_CACHE_FILE, SNOWFLAKE_CACHE_FILE]
     for cache_file in cache_files:
         try:
+            _CACHE_MEM.pop(cache_file, None)
             if os.path.exists(cache_file):
                 os.remove(cache_file)
-                logger.info(f"🗑️ Cleared cache file: {cache_file}")
+                logger.info("🗑️ Cleared cache file: %s", cache_file)
             else:
-                logger.info(f"📁 Cache file not found: {cache_file}")
+                logger.info("📁 Cache file not found: %s", cache_file)
         except Exception as e:
-            logger.error(f"❌ Error clearing cache file {cache_file}: {e}")
+            logger.error("❌ Error clearing cache file %s: %s", cache_file, e)
 
 
 def get_cache_status():
@@ -74,48 +158,193 @@ def get_cache_status():
         if os.path.exists(cache_file):
             cache_data = load_cache_from_file(cache_file)
             if cache_data and 'timestamp' in cache_data:
-                cache_time = datetime.fromisoformat(cache_data['timestamp'])
-                age = datetime.now() - cache_time
-                is_valid = is_cache_valid(cache_file)
+                # Reuse the data already loaded, applying the same expiry rule as load_valid_cache
+                age = cache_age(cache_file, cache_data)
+                is_valid = age < timedelta(hours=CACHE_EXPIRY_HOURS)
                 status = "✅ Valid" if is_valid else "⏰ Expired"
-                logger.info(f"{name} cache: {status} (age: {age}, items: {len(cache_data.get('data', []))})")
+                logger.info("%s cache: %s (age: %s, items: %s)", name, status, age, len(cache_data.get('data', [])))
             else:
-                logger.info(f"{name} cache: ❌ Invalid format")
+                logger.info("%s cache: ❌ Invalid format", name)
         else:
-            logger.info(f"{name} cache: 📁 Not found")
+            logger.info("%s cache: 📁 Not found", name)
 
 
-def list_s3_bucket_objects(bucket_name: str = S3_BUCKET_NAME) -> List[str]:
+def _save_asset(asset: Asset, label: str) -> Optional[AssetMutationResponse]:
     """
-    List objects in a public S3 bucket and return their keys
+    Save a single asset, logging and swallowing any error so one failure doesn't stop the others
     """
     try:
-        # Create S3 client for public bucket access
-        s3 = boto3.client('s3', config=Config(signature_version=UNSIGNED))
+        return client.asset.save(asset)
+    except Exception as e:
+        logger.error("❌ Error saving %s %s: %s", label, asset.name, e)
+        return None
 
-        # List objects in the specified bucket
-        response = s3.list_objects_v2(Bucket=bucket_name)
-        objects = response.get('Contents', [])
-        logger.info(f"📦 Found {len(objects)} objects in S3 bucket '{bucket_name}':")
 
-        object_keys = []
-        for obj in objects:
-            logger.info(f"  📄 {obj['Key']} (Size: {obj['Size']} bytes, Modified: {obj['LastModified']})")
-            object_keys.append(obj['Key'])
+def _save_batch(batch: List[Asset], label: str) -> Tuple[List[AssetMutationResponse], int]:
+    """
+    Save one batch of assets in a single bulk request, falling back to concurrent per-asset saves if it fails
+    """
+    try:
+        return [client.asset.save(batch)], len(batch)
+    except Exception as e:
+        logger.warning("⚠️ Bulk save of %s %s failed, retrying one by one: %s", len(batch), label, e)
+
+    with ThreadPoolExecutor(max_workers=SAVE_MAX_WORKERS) as executor:
+        results = executor.map(functools.partial(_save_asset, label=label), batch)
+        responses = [response for response in results if response is not None]
+
+    return responses, len(responses)
+
+
+def save_assets(assets: List[Asset], label: str, batch_size: Optional[int] = None) -> Tuple[List[AssetMutationResponse], int]:
+    """
+    Save assets in bulk requests of at most batch_size assets each (all at once if not set),
+    sending up to SAVE_BATCH_WORKERS requests concurrently
+
+    Args:
+        assets: Assets to create or update
+        label: Human-readable asset description used in log messages
+        batch_size: Maximum number of assets sent per request
+
+    Returns:
+        Tuple of (mutation responses, number of assets saved successfully)
+    """
+    if not assets:
+        return [], 0
+
+    batch_size = batch_size or len(assets)
+    batches = [assets[start:start + batch_size] for start in range(0, len(assets), batch_size)]
+    responses = []
+    saved_count = 0
+
+    with ThreadPoolExecutor(max_workers=min(SAVE_BATCH_WORKERS, len(batches))) as executor:
+        for batch_responses, batch_saved in executor.map(functools.partial(_save_batch, label=label), batches):
+            responses.extend(batch_responses)
+            saved_count += batch_saved
+
+    return responses, saved_count
+
+
+def bucket_by_arn_request(bucket_arn: str) -> IndexSearchRequest:
+    """
+    Build a search request for the S3 bucket registered with the given ARN
+    """
+    return (
+        FluentSearch()
+        .where(Asset.TYPE_NAME.eq("S3Bucket"))
+        .where(S3Bucket.AWS_ARN.eq(bucket_arn))
+        .include_on_results(Asset.QUALIFIED_NAME)
+        .page_size(1)
+    ).to_request()
+
+
+def objects_in_bucket_request(bucket_qualified_name: str, object_names: List[str]) -> IndexSearchRequest:
+    """
+    Build a search request for the named, active S3 objects within a bucket
+    """
+    return (
+        FluentSearch()
+        .where(CompoundQuery.active_assets())
+        .where(Asset.TYPE_NAME.eq("S3Object"))
+        .where(S3Object.S3BUCKET_QUALIFIED_NAME.eq(bucket_qualified_name))
+        .where(Asset.NAME.within(object_names))
+        .include_on_results(Asset.QUALIFIED_NAME)
+        .include_on_results(Asset.NAME)
+        .include_on_results(Asset.CONNECTION_QUALIFIED_NAME)
+        .page_size(500)
+    ).to_request()
+
+
+def connection_assets_request(connection_qualified_name: str) -> IndexSearchRequest:
+    """
+    Build a search request for the active database assets under a connection
+    """
+    return (
+        FluentSearch()
+        .where(CompoundQuery.active_assets())
+        .where(Asset.QUALIFIED_NAME.startswith(f"{connection_qualified_name}/"))
+        .where(Asset.TYPE_NAME.within(CONNECTION_ASSET_TYPES))
+        .include_on_results(Asset.QUALIFIED_NAME)
+        .include_on_results(Asset.NAME)
+        .include_on_results(Asset.TYPE_NAME)
+        .page_size(CONNECTION_ASSETS_PAGE_SIZE)
+    ).to_request()
+
+
+def processes_with_prefix_request(qualified_name_prefix: str) -> IndexSearchRequest:
+    """
+    Build a search request for the active lineage processes whose qualified names start with a prefix,
+    including the qualified names of their inputs and outputs
+    """
+    return (
+        FluentSearch()
+        .where(CompoundQuery.active_assets())
+        .where(Asset.TYPE_NAME.eq("Process"))
+        .where(Asset.QUALIFIED_NAME.startswith(qualified_name_prefix))
+        .include_on_results(Asset.QUALIFIED_NAME)
+        .include_on_results("inputs")
+        .include_on_results("outputs")
+        .include_on_relations(Asset.QUALIFIED_NAME)
+        .page_size(CONNECTION_ASSETS_PAGE_SIZE)
+    ).to_request()
+
+
+def list_s3_bucket_objects(bucket_name: str = S3_BUCKET_NAME, prefix: str = "") -> Optional[List[str]]:
+    """
+    List objects in a public S3 bucket and return their keys
+
+    Args:
+        bucket_name: Name of the S3 bucket to list
+        prefix: Only list keys starting with this prefix (filtered server-side by S3)
+
+    Returns:
+        List of object keys, or None if the bucket could not be listed
+    """
+    try:
+        # Paginate so buckets with more than 1000 keys are listed completely
+        paginator = s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix, PaginationConfig={'PageSize': 1000})
 
+        object_keys = []
+        log_each_object = logger.isEnabledFor(logging.DEBUG)
+        for page in pages:
+            for obj in page.get('Contents', []):
+                if log_each_object:
+                    logger.debug("  📄 %s (Size: %s bytes, Modified: %s)", obj['Key'], obj['Size'], obj['LastModified'])
+                object_keys.append(obj['Key'])
+
+        logger.info("📦 Found %s objects in S3 bucket '%s'", len(object_keys), bucket_name)
         return object_keys
 
     except Exception as e:
-        logger.error(f"❌ Error listing S3 objects: {e}")
-        return []
+        logger.error("❌ Error listing S3 objects: %s", e)
+        return None
 
 
-def integration_with_S3(bucket_name: str = S3_BUCKET_NAME, bucket_arn: str = S3_BUCKET_ARN, prefix: str = S3_PREFIX):
+def integration_with_S3(
+    bucket_name: str = S3_BUCKET_NAME,
+    bucket_arn: str = S3_BUCKET_ARN,
+    prefix: str = S3_PREFIX,
+    s3_filenames: Optional[List[str]] = None
+):
     """
     Complete S3 integration workflow: setup connection, register bucket, and create objects
+
+    Args:
+        bucket_name: Name of the S3 bucket to register
+        bucket_arn: ARN of the S3 bucket
+        prefix: Prefix added to each S3 object registered in Atlan
+        s3_filenames: Object keys already listed from the bucket (listed here if not provided)
     """
     logger.info("🚀 Starting S3 integration workflow...")
 
+    if s3_filenames is None:
+        logger.info("🔍 Getting list of files from S3 bucket...")
+        s3_filenames = list_s3_bucket_objects(bucket_name)
+        if s3_filenames is None:
+            logger.error("❌ Could not list S3 bucket '%s', aborting S3 integration", bucket_name)
+            return None
+
     # ------------- setup s3 connection ---------------
     logger.info("🔍 Setting up S3 connection...")
 
@@ -126,7 +355,7 @@ def integration_with_S3(bucket_name: str = S3_BUCKET_NAME, bucket_arn: str = S3_
     )
 
     if existing_connection_qn:
-        logger.info(f"✅ S3 connection already exists: {existing_connection_qn}")
+        logger.info("✅ S3 connection already exists: %s", existing_connection_qn)
         connection_qualified_name = existing_connection_qn
     else:
         logger.info("🔧 Creating new S3 connection...")
@@ -139,29 +368,24 @@ def integration_with_S3(bucket_name: str = S3_BUCKET_NAME, bucket_arn: str = S3_
             )
             response = client.asset.save(connection)
             connection_qualified_name = response.assets_created(asset_type=Connection)[0].qualified_name
-            logger.info(f"✅ S3 connection created successfully: {connection_qualified_name}")
+            _lookup_connection_qualified_name.cache_clear()
+            logger.info("✅ S3 connection created successfully: %s", connection_qualified_name)
         except Exception as e:
-            logger.error(f"❌ Error creating S3 connection: {e}")
+            logger.error("❌ Error creating S3 connection: %s", e)
             return None
 
     # ------------- register s3 bucket ---------------
     logger.info("🔍 Checking if S3 bucket already exists...")
 
-    search_request = (
-        FluentSearch()
-        .where(Asset.TYPE_NAME.eq("S3Bucket"))
-        .where(S3Bucket.AWS_ARN.eq(bucket_arn))
-        .include_on_results(Asset.QUALIFIED_NAME)
-        .include_on_results(Asset.NAME)
-        .page_size(1)
-    ).to_request()
+    search_request = bucket_by_arn_request(bucket_arn)
 
     search_response = client.asset.search(search_request)
-    existing_buckets = list(search_response)
+    # Only the first match is needed; stop before the iterator pages through the rest
+    existing_bucket = next(iter(search_response), None)
 
-    if existing_buckets:
-        bucket_qualified_name = existing_buckets[0].qualified_name
-        logger.info(f"✅ S3 bucket already exists: {bucket_qualified_name}")
+    if existing_bucket:
+        bucket_qualified_name = existing_bucket.qualified_name
+        logger.info("✅ S3 bucket already exists: %s", bucket_qualified_name)
     else:
         logger.info("🔧 Creating new S3 bucket...")
         s3bucket = S3Bucket.creator(
@@ -172,40 +396,29 @@ def integration_with_S3(bucket_name: str = S3_BUCKET_NAME, bucket_arn: str = S3_
         s3bucket.s3_object_count = 8  # Based on the 8 CSV files we found
         response = client.asset.save(s3bucket)
         bucket_qualified_name = response.assets_created(asset_type=S3Bucket)[0].qualified_name
-        logger.info(f"✅ S3 bucket created successfully: {bucket_qualified_name}")
+        logger.info("✅ S3 bucket created successfully: %s", bucket_qualified_name)
 
     # ------------- register s3 objects with ary prefix ---------------
-    logger.info("🔍 Getting list of files from S3 bucket...")
-
-    # Get actual files from S3 bucket using boto3
-    s3 = boto3.client('s3', config=Config(signature_version=UNSIGNED))
-    response = s3.list_objects_v2(Bucket=bucket_name)
-    s3_filenames = [obj['Key'] for obj in response.get('Contents', [])]
-    logger.info(f"📦 Found {len(s3_filenames)} files in S3 bucket: {s3_filenames}")
+    logger.info("📦 Found %s files in S3 bucket", len(s3_filenames))
+    logger.debug("📦 S3 files: %s", s3_filenames)
 
     # Check if S3 objects with prefix already exist in Atlan
     logger.info("🔍 Checking if S3 objects with prefix already exist in Atlan...")
-    search_request = (
-        FluentSearch()
-        .where(Asset.TYPE_NAME.eq("S3Object"))
-        .where(S3Object.S3BUCKET_QUALIFIED_NAME.eq(bucket_qualified_name))
-        .include_on_results(Asset.QUALIFIED_NAME)
-        .include_on_results(Asset.NAME)
-        .page_size(50)
-    ).to_request()
+    search_request = objects_in_bucket_request(bucket_qualified_name, s3_filenames)
 
     search_response = client.asset.search(search_request)
-    existing_objects = list(search_response)
-    existing_object_names = [obj.name for obj in existing_objects]
+    existing_objects = {obj.qualified_name: obj for obj in search_response}
 
-    logger.info(f"📋 Found {len(existing_objects)} existing S3 objects in Atlan: {existing_object_names}")
+    logger.info("📋 Found %s existing S3 objects in Atlan", len(existing_objects))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📋 Existing S3 objects: %s", [obj.name for obj in existing_objects.values()])
 
-    # Create S3 objects with prefix directly (optimized workflow)
+    # Build every missing S3 object with prefix first, then register them in bulk saves
+    s3_objects_to_save = []
     created_s3_objects = []
 
     for file_name in s3_filenames:
         try:
-            # Create S3 object with prefix directly
             s3object = S3Object.creator_with_prefix(
                 name=file_name,
                 connection_qualified_name=connection_qualified_name,
@@ -213,27 +426,36 @@ def integration_with_S3(bucket_name: str = S3_BUCKET_NAME, bucket_arn: str = S3_
                 s3_bucket_name=bucket_name,
                 s3_bucket_qualified_name=bucket_qualified_name,
             )
-            response = client.asset.save(s3object)
+        except Exception as e:
+            logger.error("❌ Error creating S3 object %s: %s", file_name, e)
+            continue
+
+        # Reuse objects already registered with the same qualified name instead of saving them again
+        existing_object = existing_objects.get(s3object.qualified_name)
+        if existing_object:
+            created_s3_objects.append(existing_object)
+        else:
+            s3_objects_to_save.append(s3object)
+
+    logger.info("⏭️ Skipping %s S3 objects already registered in Atlan", len(created_s3_objects))
 
-            # Extract object from response
-            created_objects = response.assets_created(asset_type=S3Object)
-            updated_objects = response.assets_updated(asset_type=S3Object)
+    if s3_objects_to_save:
+        responses, saved_count = save_assets(s3_objects_to_save, "S3 objects", S3_OBJECT_BATCH_SIZE)
 
-            if created_objects:
-                created_object = created_objects[0]
-                logger.info(f"✅ Created S3 object: {file_name}")
-                logger.info(f"--📋 Qualified Name: {created_object.qualified_name}")
+        # Extract objects from the aggregate response(s)
+        log_each_object = logger.isEnabledFor(logging.DEBUG)
+        for response in responses:
+            for created_object in response.assets_created(asset_type=S3Object):
+                if log_each_object:
+                    logger.debug("✅ Created S3 object: %s (%s)", created_object.name, created_object.qualified_name)
                 created_s3_objects.append(created_object)
-            elif updated_objects:
-                updated_object = updated_objects[0]
-                logger.info(f"🔄 Updated S3 object: {file_name}")
-                logger.info(f"--📋 Qualified Name: {updated_object.qualified_name}")
+
+            for updated_object in response.assets_updated(asset_type=S3Object):
+                if log_each_object:
+                    logger.debug("🔄 Updated S3 object: %s (%s)", updated_object.name, updated_object.qualified_name)
                 created_s3_objects.append(updated_object)
-            else:
-                logger.info(f"✅ Processed S3 object: {file_name}")
 
-        except Exception as e:
-            logger.error(f"❌ Error creating S3 object {file_name}: {e}")
+        logger.info("✅ Processed %s of %s S3 objects", saved_count, len(s3_objects_to_save))
 
     logger.info("✅ S3 integration workflow completed successfully!")
     return {
@@ -247,19 +469,25 @@ def integration_with_S3(bucket_name: str = S3_BUCKET_NAME, bucket_arn: str = S3_
 
 def load_cache_from_file(filename: str) -> Optional[Dict]:
     """
-    Load cached data from JSON file
+    Load cached data from JSON file, reusing the in-process copy while the file is unchanged
     """
     try:
         if os.path.exists(filename):
+            mtime = os.stat(filename).st_mtime_ns
+            memoized = _CACHE_MEM.get(filename)
+            if memoized and memoized[0] == mtime:
+                return memoized[1]
+
             with open(filename, 'r') as f:
                 cache_data = json.load(f)
-                logger.info(f"📁 Loaded cache from {filename}")
-                return cache_data
+                logger.info("📁 Loaded cache from %s", filename)
+            _CACHE_MEM[filename] = (mtime, cache_data)
+            return cache_data
         else:
-            logger.info(f"📁 No cache file found: {filename}")
+            logger.info("📁 No cache file found: %s", filename)
             return None
     except Exception as e:
-        logger.warning(f"⚠️ Error loading cache from {filename}: {e}")
+        logger.warning("⚠️ Error loading cache from %s: %s", filename, e)
         return None
 
 
@@ -269,43 +497,95 @@ def save_cache_to_file(data: List, filename: str) -> bool:
     """
     try:
         cache_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time(),
             "data": data
         }
         with open(filename, 'w') as f:
-            json.dump(cache_data, f, indent=2)
-        logger.info(f"💾 Saved cache to {filename} with {len(data)} items")
+            json.dump(cache_data, f)
+        _CACHE_MEM[filename] = (os.stat(filename).st_mtime_ns, cache_data)
+        logger.info("💾 Saved cache to %s with %s items", filename, len(data))
         return True
     except Exception as e:
-        logger.error(f"❌ Error saving cache to {filename}: {e}")
+        logger.error("❌ Error saving cache to %s: %s", filename, e)
         return False
 
 
-def is_cache_valid(filename: str, max_age_hours: int = CACHE_EXPIRY_HOURS) -> bool:
+def cache_timestamp(cache_data: Dict) -> float:
     """
-    Check if cache file exists and is within the expiry time
+    Get a cache envelope's write time as epoch seconds (older caches store an ISO-8601 string)
+    """
+    timestamp = cache_data['timestamp']
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp).timestamp()
+    return timestamp
+
+
+def cache_file_age(filename: str) -> timedelta:
+    """
+    Time since a cache file was last written, from its modification time
+    """
+    return timedelta(seconds=time.time() - os.stat(filename).st_mtime)
+
+
+def cache_age(filename: str, cache_data: Dict) -> timedelta:
+    """
+    Effective age of a loaded cache: the older of its file modification time and its in-file timestamp
+    """
+    return max(cache_file_age(filename), timedelta(seconds=time.time() - cache_timestamp(cache_data)))
+
+
+def load_valid_cache(filename: str, max_age_hours: int = CACHE_EXPIRY_HOURS) -> Optional[Dict]:
+    """
+    Load a cache file in a single read and return it only if it is within the expiry time
     """
     try:
         if not os.path.exists(filename):
-            return False
+            return None
+
+        # A file last written before the expiry window cannot hold fresh data, so skip parsing it
+        file_age = cache_file_age(filename)
+        if file_age >= timedelta(hours=max_age_hours):
+            logger.info("⏰ Cache %s expired (age: %s)", filename, file_age)
+            return None
 
+        # The in-file timestamp stays authoritative: a git checkout resets mtimes on committed caches
         cache_data = load_cache_from_file(filename)
         if not cache_data or 'timestamp' not in cache_data:
-            return False
+            return None
 
-        cache_time = datetime.fromisoformat(cache_data['timestamp'])
-        expiry_time = cache_time + timedelta(hours=max_age_hours)
+        age = cache_age(filename, cache_data)
 
-        is_valid = datetime.now() < expiry_time
-        if is_valid:
-            logger.info(f"✅ Cache {filename} is valid (age: {datetime.now() - cache_time})")
-        else:
-            logger.info(f"⏰ Cache {filename} expired (age: {datetime.now() - cache_time})")
+        if age < timedelta(hours=max_age_hours):
+            logger.info("✅ Cache %s is valid (age: %s)", filename, age)
+            return cache_data
 
-        return is_valid
+        logger.info("⏰ Cache %s expired (age: %s)", filename, age)
+        return None
     except Exception as e:
-        logger.warning(f"⚠️ Error checking cache validity for {filename}: {e}")
-        return False
+        logger.warning("⚠️ Error checking cache validity for %s: %s", filename, e)
+        return None
+
+
+def is_cache_valid(filename: str, max_age_hours: int = CACHE_EXPIRY_HOURS) -> bool:
+    """
+    Check if cache file exists and is within the expiry time
+    """
+    return load_valid_cache(filename, max_age_hours) is not None
+
+
+@functools.lru_cache(maxsize=32)
+def _lookup_connection_qualified_name(connection_name: str, connection_type: AtlanConnectorType) -> Optional[str]:
+    """
+    Look up the qualified name of a connection in Atlan, memoized per process
+    """
+    connections = client.asset.find_connections_by_name(
+        name=connection_name,
+        connector_type=connection_type,
+        attributes=[]
+    )
+    if connections and len(connections) > 0:
+        return connections[0].qualified_name
+    return None
 
 
 def get_connection_qualified_name(connection_name: str, connection_type: AtlanConnectorType) -> Optional[str]:
@@ -313,92 +593,108 @@ def get_connection_qualified_name(connection_name: str, connection_type: AtlanCo
     Get the qualified name of a connection
     """
     try:
-        connections = client.asset.find_connections_by_name(
-            name=connection_name,
-            connector_type=connection_type,
-            attributes=[]
-        )
-        if connections and len(connections) > 0:
-            return connections[0].qualified_name
+        connection_qualified_name = _lookup_connection_qualified_name(connection_name, connection_type)
+        if connection_qualified_name:
+            return connection_qualified_name
         else:
-            logger.warning(f"No connection found with name: {connection_name}")
+            logger.warning("No connection found with name: %s", connection_name)
             return None
-    except Exception as e:
-        logger.error(f"Error finding connection {connection_name}: {e}")
+    except (AtlanError, httpx.HTTPError) as e:
+        logger.error("Error finding connection %s: %s", connection_name, e)
         return None
-    
 
-def find_postgres_assets(force_refresh: bool = False) -> List[List[str]]:
+
+def find_connection_assets(
+    connection_name: str,
+    connection_type: AtlanConnectorType,
+    cache_file: str,
+    label: str,
+    icon: str,
+    force_refresh: bool = False
+) -> List[AssetRow]:
     """
-    Find all PostgreSQL assets (tables, columns, schemas) for postgres-ary connection
+    Find all assets (tables, columns, schemas) under a connection, using the local cache when valid
 
     Args:
+        connection_name: Name of the connection in Atlan
+        connection_type: Connector type of the connection
+        cache_file: Cache file used to store the assets
+        label: Human-readable source name used in log messages
+        icon: Emoji prefix used in log messages
         force_refresh: If True, bypass cache and fetch fresh data
 
     Returns:
-        List of assets as [qualified_name, name, type_name] tuples
+        List of AssetRow(qualified_name, name, type_name) tuples
     """
     # Check cache first unless force refresh is requested
-    if not force_refresh and is_cache_valid(POSTGRES_CACHE_FILE):
-        cache_data = load_cache_from_file(POSTGRES_CACHE_FILE)
+    if not force_refresh:
+        cache_data = load_valid_cache(cache_file)
         if cache_data and 'data' in cache_data:
-            logger.info(f"📊 Using cached PostgreSQL tables ({len(cache_data['data'])} items)")
-            return cache_data['data']
-
-    logger.info("📊 Fetching PostgreSQL assets from API...")
-    postgres_ary_qualified_name = get_connection_qualified_name(
-            connection_name=POSTGRES_CONNECTION_NAME,
-            connection_type=AtlanConnectorType.POSTGRES,
+            assets = [AssetRow._make(row) for row in cache_data['data'] if len(row) == len(AssetRow._fields)]
+            logger.info("%s Using cached %s assets (%s items)", icon, label, len(assets))
+            return assets
+
+    logger.info("%s Fetching %s assets from API...", icon, label)
+    connection_qualified_name = get_connection_qualified_name(
+        connection_name=connection_name,
+        connection_type=connection_type,
     )
-    logger.info(f"📊 Found postgres-ary connection: {postgres_ary_qualified_name}")
+    logger.info("%s Found %s connection: %s", icon, connection_name, connection_qualified_name)
 
-    postgres_assets = []
+    assets = []
 
-    if postgres_ary_qualified_name:
+    if connection_qualified_name:
         try:
-            # Search for all assets and filter by qualified name prefix
-            search_request = (
-                FluentSearch()
-                .where(Asset.QUALIFIED_NAME.startswith(postgres_ary_qualified_name))
-                .include_on_results(Asset.QUALIFIED_NAME)
-                .include_on_results(Asset.NAME)
-                .include_on_results(Asset.TYPE_NAME)
-            ).to_request()
-            
+            # Search for the connection's assets, filtered server-side by qualified name prefix and type
+            search_request = connection_assets_request(connection_qualified_name)
 
             response = client.asset.search(search_request)
 
             # Iterate through all pages of results
-            logger.info("📊 Iterating through all pages of PostgreSQL assets results...")
-            total_processed = 0
+            logger.info("%s Iterating through all pages of %s assets results...", icon, label)
 
             for asset in response:  # This iterates through all pages automatically
-                total_processed += 1
-
-                # Filter for assets that belong to postgres-ary connection
-                if (asset.qualified_name and
-                    asset.qualified_name.startswith(f"{postgres_ary_qualified_name}/")):
-                    postgres_assets.append([asset.qualified_name, asset.name, asset.type_name])
+                assets.append(AssetRow(asset.qualified_name, asset.name, asset.type_name))
 
                 # Log progress every 100 assets
-                if total_processed % 100 == 0:
-                    logger.info(f"📊 Processed {total_processed} assets, found {len(postgres_assets)} PostgreSQL assets so far...")
+                if len(assets) % 100 == 0:
+                    logger.info("%s Processed %s %s assets so far...", icon, len(assets), label)
 
-            logger.info(f"📊 Completed search: processed {total_processed} total assets")
-            logger.info(f"📊 Found {len(postgres_assets)} tables in postgres-ary connection:")
-            for asset in postgres_assets:
-                logger.info(f"  🔹 {asset[1]} (Type: {asset[2]}, Qualified Name: {asset[0]})")
+            logger.info("%s Completed search: found %s assets in %s connection", icon, len(assets), connection_name)
+            if logger.isEnabledFor(logging.DEBUG):
+                for asset in assets:
+                    logger.debug("  🔹 %s (Type: %s, Qualified Name: %s)", asset.name, asset.type_name, asset.qualified_name)
 
             # Save to cache
-            save_cache_to_file(postgres_assets, POSTGRES_CACHE_FILE)
+            save_cache_to_file(assets, cache_file)
 
-        except Exception as e:
-            logger.error(f"❌ Error searching postgres-ary assets: {e}")
+        except (AtlanError, httpx.HTTPError) as e:
+            logger.error("❌ Error searching %s assets: %s", connection_name, e)
 
-    return postgres_assets
+    return assets
 
 
-def find_snowflake_assets(force_refresh: bool = False) -> List[List[str]]:
+def find_postgres_assets(force_refresh: bool = False) -> List[AssetRow]:
+    """
+    Find all PostgreSQL assets (tables, columns, schemas) for postgres-ary connection
+
+    Args:
+        force_refresh: If True, bypass cache and fetch fresh data
+
+    Returns:
+        List of AssetRow(qualified_name, name, type_name) tuples
+    """
+    return find_connection_assets(
+        connection_name=POSTGRES_CONNECTION_NAME,
+        connection_type=AtlanConnectorType.POSTGRES,
+        cache_file=POSTGRES_CACHE_FILE,
+        label="PostgreSQL",
+        icon="📊",
+        force_refresh=force_refresh,
+    )
+
+
+def find_snowflake_assets(force_refresh: bool = False) -> List[AssetRow]:
     """
     Find all Snowflake assets (tables, columns, schemas) for snowflake-ary connection
 
@@ -406,67 +702,102 @@ def find_snowflake_assets(force_refresh: bool = False) -> List[List[str]]:
         force_refresh: If True, bypass cache and fetch fresh data
 
     Returns:
-        List of assets as [qualified_name, name, type_name] tuples
+        List of AssetRow(qualified_name, name, type_name) tuples
     """
-    # Check cache first unless force refresh is requested
-    if not force_refresh and is_cache_valid(SNOWFLAKE_CACHE_FILE):
-        cache_data = load_cache_from_file(SNOWFLAKE_CACHE_FILE)
-        if cache_data and 'data' in cache_data:
-            logger.info(f"❄️ Using cached Snowflake assets ({len(cache_data['data'])} items)")
-            return cache_data['data']
+    return find_connection_assets(
+        connection_name=SNOWFLAKE_CONNECTION_NAME,
+        connection_type=AtlanConnectorType.SNOWFLAKE,
+        cache_file=SNOWFLAKE_CACHE_FILE,
+        label="Snowflake",
+        icon="❄️",
+        force_refresh=force_refresh,
+    )
 
-    logger.info("❄️ Fetching Snowflake assets from API...")
-    snowflake_ary_qualified_name = get_connection_qualified_name(
-            connection_name=SNOWFLAKE_CONNECTION_NAME,
-            connection_type=AtlanConnectorType.SNOWFLAKE,
-        )
-    logger.info(f"❄️ Found snowflake-ary connection: {snowflake_ary_qualified_name}")
 
-    snowflake_assets = []
+def build_table_process(
+    postgres_table_name: str,
+    postgres_qualified_name: str,
+    connection_qualified_name: str,
+    snowflake_qualified_name: str
+) -> Process:
+    """
+    Build (without saving) a PostgreSQL → S3 → Snowflake table lineage process
 
-    if snowflake_ary_qualified_name:
-        try:
-            # Search for all assets and filter by qualified name prefix
-            search_request = (
-                FluentSearch()
-                .where(Asset.QUALIFIED_NAME.startswith(snowflake_ary_qualified_name))
-                .include_on_results(Asset.QUALIFIED_NAME)
-                .include_on_results(Asset.NAME)
-                .include_on_results(Asset.TYPE_NAME)
-            ).to_request()
+    Args:
+        postgres_table_name: Uppercased table name shared by all three assets
+        postgres_qualified_name: Qualified name of the PostgreSQL source table
+        connection_qualified_name: Qualified name of the S3 connection the process belongs to
+        snowflake_qualified_name: Qualified name of the Snowflake target table
 
-            response = client.asset.search(search_request)
+    Returns:
+        Process ready to be saved
+    """
+    process = Process.creator(
+        name=f"ETL Pipeline: {postgres_table_name}",
+        connection_qualified_name=connection_qualified_name,
+        process_id=f"etl_pipeline_{postgres_table_name.lower()}",
+        inputs=[
+            Table.ref_by_qualified_name(qualified_name=postgres_qualified_name)
+        ],
+        outputs=[
+            Table.ref_by_qualified_name(qualified_name=snowflake_qualified_name)
+        ]
+    )
 
-            # Iterate through all pages of results
-            logger.info("❄️ Iterating through all pages of Snowflake assets results...")
-            total_processed = 0
+    # Add process metadata
+    process.description = f"ETL pipeline: PostgreSQL {postgres_table_name} → S3 → Snowflake {postgres_table_name}"
+    process.sql = f"-- ETL process for {postgres_table_name}\n-- Extract from PostgreSQL, Load to S3, Transform and Load to Snowflake"
+    process.source_url = "https://atlan-tech-challenge.s3.amazonaws.com"
+    return process
 
-            for asset in response:  # This iterates through all pages automatically
-                total_processed += 1
 
-                # Filter for assets that belong to snowflake-ary connection
-                if (asset.qualified_name and
-                    asset.qualified_name.startswith(f"{snowflake_ary_qualified_name}/")):
-                    snowflake_assets.append([asset.qualified_name, asset.name, asset.type_name])
+def process_endpoints(process: Process) -> Tuple[frozenset, frozenset]:
+    """
+    Qualified names of a process's inputs and outputs, used to compare lineage built in this run with Atlan
+    """
+    def qualified_names(assets) -> frozenset:
+        return frozenset(
+            asset.qualified_name or (asset.unique_attributes or {}).get("qualifiedName")
+            for asset in assets or []
+        )
+
+    return qualified_names(process.inputs), qualified_names(process.outputs)
 
-                # Log progress every 100 assets
-                if total_processed % 100 == 0:
-                    logger.info(f"❄️ Processed {total_processed} assets, found {len(snowflake_assets)} Snowflake assets so far...")
 
-            logger.info(f"❄️ Completed search: processed {total_processed} total assets")
-            logger.info(f"❄️ Found {len(snowflake_assets)} assets in snowflake-ary connection:")
-            for asset in snowflake_assets:
-                logger.info(f"  🔹 {asset[1]} (Type: {asset[2]}, Qualified Name: {asset[0]})")
+def remove_existing_processes(processes: List[Process], qualified_name_prefix: str, label: str) -> List[Process]:
+    """
+    Drop lineage processes that are already registered in Atlan with the same inputs and outputs,
+    so re-runs don't save them again while processes pointing at stale assets are still repaired
 
-            # Save to cache
-            save_cache_to_file(snowflake_assets, SNOWFLAKE_CACHE_FILE)
+    Args:
+        processes: Processes built for this run
+        qualified_name_prefix: Qualified name prefix shared by all the processes
+        label: Human-readable process description used in log messages
 
-        except Exception as e:
-            logger.error(f"❌ Error searching snowflake-ary assets: {e}")
+    Returns:
+        Processes that are missing or differ in Atlan (all of them if the lookup fails)
+    """
+    try:
+        response = client.asset.search(processes_with_prefix_request(qualified_name_prefix))
+        existing_endpoints = {process.qualified_name: process_endpoints(process) for process in response}
+    except (AtlanError, httpx.HTTPError) as e:
+        logger.warning("⚠️ Could not look up existing %s, saving all of them: %s", label, e)
+        return processes
+
+    new_processes = [
+        process for process in processes
+        if existing_endpoints.get(process.qualified_name) != process_endpoints(process)
+    ]
+    logger.info("⏭️ Skipping %s %s already registered in Atlan with the same inputs and outputs", len(processes) - len(new_processes), label)
+    return new_processes
 
-    return snowflake_assets
 
-def create_table_lineage(postgres_assets: List[List[str]], s3_objects: List[S3Object], snowflake_assets: List[List[str]]):
+def create_table_lineage(
+    postgres_assets: List[AssetRow],
+    s3_objects: List[S3Object],
+    snowflake_assets: List[AssetRow],
+    connection_qualified_name: str
+):
     """
     Create table-level lineage processes: PostgreSQL tables → S3 objects → Snowflake tables
 
@@ -474,162 +805,188 @@ def create_table_lineage(postgres_assets: List[List[str]], s3_objects: List[S3Ob
         postgres_assets: List of PostgreSQL assets from find_postgres_assets()
         s3_objects: List of S3Object instances from integration_with_S3()
         snowflake_assets: List of Snowflake assets from find_snowflake_assets()
+        connection_qualified_name: Qualified name of the S3 connection the processes belong to
     """
     logger.info("🔗 Starting table-level lineage creation...")
 
     # Filter to get only tables from postgres and snowflake assets
-    postgres_tables = [asset for asset in postgres_assets if len(asset) >= 3 and asset[2] == 'Table']
-    snowflake_tables = [asset for asset in snowflake_assets if len(asset) >= 3 and asset[2] == 'Table']
-
-    logger.info(f"📊 Found {len(postgres_tables)} PostgreSQL tables")
-    logger.info(f"📦 Found {len(s3_objects)} S3 objects")
-    logger.info(f"❄️ Found {len(snowflake_tables)} Snowflake tables")
-
-    # Create lineage for each matching set of assets
-    lineage_count = 0
+    postgres_tables = [asset for asset in postgres_assets if asset.type_name == 'Table']
+    snowflake_tables = [asset for asset in snowflake_assets if asset.type_name == 'Table']
+
+    logger.info("📊 Found %s PostgreSQL tables", len(postgres_tables))
+    logger.info("📦 Found %s S3 objects", len(s3_objects))
+    logger.info("❄️ Found %s Snowflake tables", len(snowflake_tables))
+
+    if not (postgres_tables and s3_objects and snowflake_tables):
+        logger.info("⏭️ Skipping table lineage: missing PostgreSQL tables, S3 objects or Snowflake tables")
+        return
+
+    # Index S3 objects once by table name (e.g. CUSTOMERS.csv -> CUSTOMERS), keeping the first match
+    s3_by_table_name = {}
+    for s3_obj in s3_objects:
+        s3_by_table_name.setdefault(s3_obj.name.upper().removesuffix('.CSV'), s3_obj)
+
+    # Index Snowflake tables once by uppercased name, keeping the first match
+    snowflake_by_table_name = {}
+    for sf_table in snowflake_tables:
+        snowflake_by_table_name.setdefault(sf_table.name.upper(), sf_table)
+
+    # Build a lineage process for each matching set of assets
+    processes = []
+    prepared_records = []
+    build_errors = []
     for postgres_table in postgres_tables:
-        postgres_table_name = postgres_table[1].upper()  # Table name
-        postgres_qualified_name = postgres_table[0]      # Qualified name
+        postgres_table_name = postgres_table.name.upper()
+        postgres_qualified_name = postgres_table.qualified_name
 
         # Find matching S3 object by name
-        matching_s3_objects = [
-            s3_obj for s3_obj in s3_objects
-            if s3_obj.name.upper().replace('.CSV', '') == postgres_table_name
-        ]
+        s3_object = s3_by_table_name.get(postgres_table_name)
 
         # Find matching Snowflake table by name
-        matching_snowflake_tables = [
-            sf_table for sf_table in snowflake_tables
-            if sf_table[1].upper() == postgres_table_name
-        ]
+        snowflake_table = snowflake_by_table_name.get(postgres_table_name)
 
-        if matching_s3_objects and matching_snowflake_tables:
-            s3_object = matching_s3_objects[0]
-            snowflake_table = matching_snowflake_tables[0]
-            snowflake_qualified_name = snowflake_table[0]
+        if s3_object and snowflake_table:
+            snowflake_qualified_name = snowflake_table.qualified_name
 
             try:
-                # Create PostgreSQL → S3 → Snowflake lineage process
-                process = Process.creator(
-                    name=f"ETL Pipeline: {postgres_table_name}",
-                    connection_qualified_name=s3_object.connection_qualified_name,
-                    process_id=f"etl_pipeline_{postgres_table_name.lower()}",
-                    inputs=[
-                        Table.ref_by_qualified_name(qualified_name=postgres_qualified_name)
-                    ],
-                    outputs=[
-                        Table.ref_by_qualified_name(qualified_name=snowflake_qualified_name)
-                    ]
+                process = build_table_process(
+                    postgres_table_name=postgres_table_name,
+                    postgres_qualified_name=postgres_qualified_name,
+                    connection_qualified_name=connection_qualified_name,
+                    snowflake_qualified_name=snowflake_qualified_name,
+                )
+                processes.append(process)
+                prepared_records.append(
+                    (postgres_table_name, postgres_qualified_name, s3_object.qualified_name, snowflake_qualified_name)
                 )
 
-                # Add process metadata
-                process.description = f"ETL pipeline: PostgreSQL {postgres_table_name} → S3 → Snowflake {postgres_table_name}"
-                process.sql = f"-- ETL process for {postgres_table_name}\n-- Extract from PostgreSQL, Load to S3, Transform and Load to Snowflake"
-                process.source_url = "https://atlan-tech-challenge.s3.amazonaws.com"
+            except Exception as e:
+                build_errors.append((postgres_table_name, e))
 
-                # Save the process
-                client.asset.save(process)
-                logger.info(f"✅ Created table lineage process: {postgres_table_name}")
-                logger.info(f"   📊 PostgreSQL: {postgres_qualified_name}")
-                logger.info(f"   📦 S3: {s3_object.qualified_name}")
-                logger.info(f"   ❄️ Snowflake: {snowflake_qualified_name}")
+    logger.info("🔧 Prepared %s table lineage processes", len(prepared_records))
+    if prepared_records and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\n".join(
+            f"   🔧 {table_name}: 📊 {postgres_qn} → 📦 {s3_qn} → ❄️ {snowflake_qn}"
+            for table_name, postgres_qn, s3_qn, snowflake_qn in prepared_records
+        ))
 
-                lineage_count += 1
+    for postgres_table_name, e in build_errors:
+        logger.error("❌ Error creating table lineage for %s: %s", postgres_table_name, e)
 
-            except Exception as e:
-                logger.error(f"❌ Error creating table lineage for {postgres_table_name}: {e}")
+    if processes:
+        processes = remove_existing_processes(
+            processes, f"{connection_qualified_name}/etl_pipeline_", "table lineage processes"
+        )
+
+    # Save all processes in bulk requests
+    lineage_count = 0
+    if processes:
+        _, lineage_count = save_assets(processes, "table lineage processes", PROCESS_BATCH_SIZE)
+        logger.info("✅ Saved %s table lineage processes", lineage_count)
 
-    logger.info(f"🎉 Table lineage creation completed! Created {lineage_count} lineage processes.")
+    logger.info("🎉 Table lineage creation completed! Created %s lineage processes.", lineage_count)
 
 
-def create_column_lineage(postgres_assets: List[List[str]], snowflake_assets: List[List[str]]):
+def create_column_lineage(
+    postgres_assets: List[AssetRow],
+    snowflake_assets: List[AssetRow],
+    connection_qualified_name: str
+):
     """
     Create column-level lineage processes: PostgreSQL columns → Snowflake columns
 
     Args:
         postgres_assets: List of PostgreSQL assets from find_postgres_assets()
         snowflake_assets: List of Snowflake assets from find_snowflake_assets()
+        connection_qualified_name: Qualified name of the S3 connection the processes belong to
     """
     logger.info("🔗 Starting column-level lineage creation...")
 
     # Filter to get only columns from postgres and snowflake assets
-    postgres_columns = [asset for asset in postgres_assets if len(asset) >= 3 and asset[2] == 'Column']
-    snowflake_columns = [asset for asset in snowflake_assets if len(asset) >= 3 and asset[2] == 'Column']
+    postgres_columns = [asset for asset in postgres_assets if asset.type_name == 'Column']
+    snowflake_columns = [asset for asset in snowflake_assets if asset.type_name == 'Column']
 
-    logger.info(f"📊 Found {len(postgres_columns)} PostgreSQL columns")
-    logger.info(f"❄️ Found {len(snowflake_columns)} Snowflake columns")
+    logger.info("📊 Found %s PostgreSQL columns", len(postgres_columns))
+    logger.info("❄️ Found %s Snowflake columns", len(snowflake_columns))
 
-    # Group columns by table name for easier matching
-    postgres_cols_by_table = {}
+    if not postgres_columns or not snowflake_columns:
+        logger.info("⏭️ Skipping column lineage: no columns to match on one side")
+        return
+
+    # Group columns by table name for easier matching, starting with Snowflake so PostgreSQL
+    # columns of tables that have no Snowflake counterpart are never collected
     snowflake_cols_by_table = {}
+    postgres_cols_by_table = {}
+
+    for col in snowflake_columns:
+        # Extract table name from qualified name, keeping the first column seen for each name
+        table_name = col.qualified_name.rsplit('/', 2)[-2].upper()
+        column_name = col.name.upper()
+        snowflake_cols_by_table.setdefault(table_name, {}).setdefault(column_name, col.qualified_name)
 
     for col in postgres_columns:
         # Extract table name from qualified name (e.g., .../CUSTOMERS/CUSTOMERID -> CUSTOMERS)
-        table_name = col[0].split('/')[-2].upper()
-        column_name = col[1].upper()
-        if table_name not in postgres_cols_by_table:
-            postgres_cols_by_table[table_name] = []
-        postgres_cols_by_table[table_name].append((column_name, col[0]))
+        table_name = col.qualified_name.rsplit('/', 2)[-2].upper()
+        if table_name in snowflake_cols_by_table:
+            postgres_cols_by_table.setdefault(table_name, []).append((col.name.upper(), col.qualified_name))
+
+    # Build column lineage processes for tables present on both sides
+    processes = []
+    for table_name, postgres_cols in postgres_cols_by_table.items():
+        snowflake_cols = snowflake_cols_by_table[table_name]
+
+        logger.debug("📋 Processing column lineage for table: %s", table_name)
+        logger.debug("   📊 PostgreSQL columns: %s", len(postgres_cols))
+        logger.debug("   ❄️ Snowflake columns: %s", len(snowflake_cols))
+
+        table_name_lower = table_name.lower()
+
+        # Match columns by name and create lineage
+        for pg_col_name, pg_col_qualified_name in postgres_cols:
+            # Find matching Snowflake column
+            sf_col_qualified_name = snowflake_cols.get(pg_col_name)
+
+            if sf_col_qualified_name:
+                try:
+                    # Create column-level lineage process
+                    process = Process.creator(
+                        name=f"Column Mapping: {table_name}.{pg_col_name}",
+                        connection_qualified_name=connection_qualified_name,
+                        process_id=f"col_mapping_{table_name_lower}_{pg_col_name.lower()}",
+                        inputs=[
+                            Column.ref_by_qualified_name(qualified_name=pg_col_qualified_name)
+                        ],
+                        outputs=[
+                            Column.ref_by_qualified_name(qualified_name=sf_col_qualified_name)
+                        ]
+                    )
+
+                    # Add process metadata
+                    process.description = f"Column mapping: PostgreSQL {table_name}.{pg_col_name} → Snowflake {table_name}.{pg_col_name}"
+                    process.sql = f"-- Column-level ETL for {table_name}.{pg_col_name}"
+
+                    processes.append(process)
+                    logger.debug("🔧 Prepared column lineage: %s.%s", table_name, pg_col_name)
+
+                except Exception as e:
+                    logger.error("❌ Error creating column lineage for %s.%s: %s", table_name, pg_col_name, e)
+
+    logger.info(
+        "🔧 Prepared %s column lineage processes across %s tables", len(processes), len(postgres_cols_by_table)
+    )
 
-    for col in snowflake_columns:
-        # Extract table name from qualified name
-        table_name = col[0].split('/')[-2].upper()
-        column_name = col[1].upper()
-        if table_name not in snowflake_cols_by_table:
-            snowflake_cols_by_table[table_name] = []
-        snowflake_cols_by_table[table_name].append((column_name, col[0]))
-
-    # Create column lineage for matching tables
+    if processes:
+        processes = remove_existing_processes(
+            processes, f"{connection_qualified_name}/col_mapping_", "column lineage processes"
+        )
+
+    # Save all column processes in bulk requests
     column_lineage_count = 0
-    for table_name in postgres_cols_by_table:
-        if table_name in snowflake_cols_by_table:
-            postgres_cols = postgres_cols_by_table[table_name]
-            snowflake_cols = snowflake_cols_by_table[table_name]
-
-            logger.info(f"📋 Processing column lineage for table: {table_name}")
-            logger.info(f"   📊 PostgreSQL columns: {len(postgres_cols)}")
-            logger.info(f"   ❄️ Snowflake columns: {len(snowflake_cols)}")
-
-            # Match columns by name and create lineage
-            for pg_col_name, pg_col_qualified_name in postgres_cols:
-                # Find matching Snowflake column
-                matching_sf_cols = [
-                    (sf_col_name, sf_col_qualified_name)
-                    for sf_col_name, sf_col_qualified_name in snowflake_cols
-                    if sf_col_name == pg_col_name
-                ]
-
-                if matching_sf_cols:
-                    sf_col_name, sf_col_qualified_name = matching_sf_cols[0]
-
-                    try:
-                        # Create column-level lineage process
-                        process = Process.creator(
-                            name=f"Column Mapping: {table_name}.{pg_col_name}",
-                            connection_qualified_name="default/s3/1758470378",  # Use S3 connection
-                            process_id=f"col_mapping_{table_name.lower()}_{pg_col_name.lower()}",
-                            inputs=[
-                                Column.ref_by_qualified_name(qualified_name=pg_col_qualified_name)
-                            ],
-                            outputs=[
-                                Column.ref_by_qualified_name(qualified_name=sf_col_qualified_name)
-                            ]
-                        )
-
-                        # Add process metadata
-                        process.description = f"Column mapping: PostgreSQL {table_name}.{pg_col_name} → Snowflake {table_name}.{sf_col_name}"
-                        process.sql = f"-- Column-level ETL for {table_name}.{pg_col_name}"
-
-                        # Save the process
-                        client.asset.save(process)
-                        logger.info(f"✅ Created column lineage: {table_name}.{pg_col_name}")
-
-                        column_lineage_count += 1
-
-                    except Exception as e:
-                        logger.error(f"❌ Error creating column lineage for {table_name}.{pg_col_name}: {e}")
-
-    logger.info(f"🎉 Column lineage creation completed! Created {column_lineage_count} column lineage processes.")
+    if processes:
+        _, column_lineage_count = save_assets(processes, "column lineage processes", PROCESS_BATCH_SIZE)
+        logger.info("✅ Saved %s column lineage processes", column_lineage_count)
+
+    logger.info("🎉 Column lineage creation completed! Created %s column lineage processes.", column_lineage_count)
 
 
 if __name__ == "__main__":
@@ -640,43 +997,52 @@ if __name__ == "__main__":
         get_cache_status()
 
         # -------- Get all assets once ------------
-        logger.info("🔍 Fetching assets from Atlan...")
-        postgres_assets = find_postgres_assets()
-        logger.info(f"Found {len(postgres_assets)} PostgreSQL assets")
-
-        snowflake_assets = find_snowflake_assets()
-        logger.info(f"Found {len(snowflake_assets)} Snowflake assets")
-
-        # List S3 bucket objects
-        s3_files = list_s3_bucket_objects()
+        logger.info("🔍 Fetching assets from Atlan and listing S3 bucket objects...")
+        # PostgreSQL, Snowflake and S3 lookups are independent, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            postgres_future = executor.submit(find_postgres_assets)
+            snowflake_future = executor.submit(find_snowflake_assets)
+            s3_files_future = executor.submit(list_s3_bucket_objects)
+            postgres_assets = postgres_future.result()
+            snowflake_assets = snowflake_future.result()
+            s3_files = s3_files_future.result()
+
+        logger.info("Found %s PostgreSQL assets", len(postgres_assets))
+        logger.info("Found %s Snowflake assets", len(snowflake_assets))
 
         # ------ Run S3 integration workflow --------
         logger.info("🚀 Running S3 integration workflow...")
-        s3_integration_result = integration_with_S3()
+        # A failed listing (None) is retried inside integration_with_S3, which aborts if it fails again
+        s3_integration_result = integration_with_S3(s3_filenames=s3_files)
 
         if s3_integration_result:
-            logger.info(f"🎉 S3 Integration Summary:")
-            logger.info(f"   Connection: {s3_integration_result['connection_qualified_name']}")
-            logger.info(f"   Bucket: {s3_integration_result['bucket_qualified_name']}")
-            logger.info(f"   Objects Created/Updated: {s3_integration_result['object_count']}")
-
-            # Create lineage connections
-            logger.info("🔗 Creating lineage between PostgreSQL → S3 → Snowflake...")
-
-            # Create table-level lineage
-            create_table_lineage(
-                postgres_assets=postgres_assets,
-                s3_objects=s3_integration_result['s3_objects'],
-                snowflake_assets=snowflake_assets
-            )
+            logger.info("🎉 S3 Integration Summary:")
+            logger.info("   Connection: %s", s3_integration_result['connection_qualified_name'])
+            logger.info("   Bucket: %s", s3_integration_result['bucket_qualified_name'])
+            logger.info("   Objects Registered: %s", s3_integration_result['object_count'])
 
-            # Create column-level lineage
-            create_column_lineage(
-                postgres_assets=postgres_assets,
-                snowflake_assets=snowflake_assets
-            )
+            if not postgres_assets or not snowflake_assets:
+                logger.error("❌ PostgreSQL or Snowflake assets not found. Cannot proceed with lineage creation.")
+            else:
+                # Create lineage connections
+                logger.info("🔗 Creating lineage between PostgreSQL → S3 → Snowflake...")
+
+                # Create table-level lineage
+                create_table_lineage(
+                    postgres_assets=postgres_assets,
+                    s3_objects=s3_integration_result['s3_objects'],
+                    snowflake_assets=snowflake_assets,
+                    connection_qualified_name=s3_integration_result['connection_qualified_name']
+                )
+
+                # Create column-level lineage
+                create_column_lineage(
+                    postgres_assets=postgres_assets,
+                    snowflake_assets=snowflake_assets,
+                    connection_qualified_name=s3_integration_result['connection_qualified_name']
+                )
 
-            logger.info("✅ Complete data lineage pipeline established successfully!")
+                logger.info("✅ Complete data lineage pipeline established successfully!")
         else:
             logger.error("❌ S3 integration failed. Cannot proceed with lineage creation.")
 